@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -16,6 +18,17 @@ class Settings(BaseSettings):
     log_level: str = 'INFO'
     environment: str = 'development'
 
+    # User Profile Enrichment (disabled when mongo_uri is not set)
+    mongo_uri: Optional[str] = None
+    mongo_database: str = 'primalab'
+    mongo_users_collection: str = 'users'
+    mongo_timeout_ms: int = 1000
+    user_profile_cache_max_memory_mb: float = 64.0
+    user_profile_cache_ttl_seconds: float = 300.0
+    user_profile_batch_size: int = 100
+    user_profile_lookup_timeout_seconds: float = 0.2
+    user_profile_failure_backoff_seconds: float = 5.0
+
 
 def get_settings() -> Settings:
     return Settings()
@@ -0,0 +1,127 @@
+import sys
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+MAX_INTERNED_PERMISSION_SETS = 1024
+
+_permission_pool: OrderedDict[Tuple[str, ...], Tuple[str, ...]] = OrderedDict()
+
+
+def intern_role(role: str) -> str:
+    return sys.intern(role)
+
+
+def intern_permissions(permissions: Iterable[str]) -> Tuple[str, ...]:
+    """Return a canonical permissions tuple shared by every identity holding the same permission set.
+
+    The pool keeps the ``MAX_INTERNED_PERMISSION_SETS`` most recently used sets. Records still holding an evicted
+    tuple keep it, later records just stop sharing it.
+    """
+    key = tuple(sys.intern(permission) for permission in permissions)
+    interned = _permission_pool.get(key)
+    if interned is not None:
+        _permission_pool.move_to_end(key)
+        return interned
+
+    _permission_pool[key] = key
+    if len(_permission_pool) > MAX_INTERNED_PERMISSION_SETS:
+        _permission_pool.popitem(last=False)
+    return key
+
+
+class VerifiedIdentity:
+    """Compact record of a validated Firebase identity.
+
+    Role strings and permission tuples are interned, so only the per-user fields count towards ``sys.getsizeof``.
+    """
+
+    __slots__ = (
+        'firebase_uid',
+        'email',
+        'name',
+        'first_name',
+        'last_name',
+        'role',
+        'permissions',
+        'picture',
+        'email_verified',
+    )
+
+    def __init__(
+        self,
+        firebase_uid: str,
+        email: str,
+        name: str,
+        first_name: str,
+        last_name: str,
+        role: str,
+        permissions: Iterable[str],
+        picture: Optional[str] = None,
+        email_verified: bool = False,
+    ):
+        self.firebase_uid = firebase_uid
+        self.email = email
+        self.name = name
+        self.first_name = first_name
+        self.last_name = last_name
+        self.role = intern_role(role)
+        self.permissions = intern_permissions(permissions)
+        self.picture = picture
+        self.email_verified = email_verified
+
+    def __sizeof__(self) -> int:
+        owned = (self.firebase_uid, self.email, self.name, self.first_name, self.last_name, self.picture)
+        return object.__sizeof__(self) + sum(sys.getsizeof(value) for value in owned if value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, VerifiedIdentity):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    # Slots stay assignable, so field-wise equality must not come with a hash that could change under a dict key
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'VerifiedIdentity(firebase_uid={self.firebase_uid!r}, email={self.email!r}, role={self.role!r})'
+
+
+class UserProfile:
+    """Role, permissions and profile fields loaded from the user store.
+
+    Fields left as ``None`` are not known to the store and fall back to the token claims.
+    """
+
+    __slots__ = ('firebase_uid', 'role', 'permissions', 'name', 'first_name', 'last_name', 'picture')
+
+    def __init__(
+        self,
+        firebase_uid: str,
+        role: Optional[str] = None,
+        permissions: Optional[Iterable[str]] = None,
+        name: Optional[str] = None,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        picture: Optional[str] = None,
+    ):
+        self.firebase_uid = firebase_uid
+        self.role = intern_role(role) if role is not None else None
+        self.permissions = intern_permissions(permissions) if permissions is not None else None
+        self.name = name
+        self.first_name = first_name
+        self.last_name = last_name
+        self.picture = picture
+
+    def __sizeof__(self) -> int:
+        owned = (self.firebase_uid, self.name, self.first_name, self.last_name, self.picture)
+        return object.__sizeof__(self) + sum(sys.getsizeof(value) for value in owned if value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UserProfile):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    # Slots stay assignable, so field-wise equality must not come with a hash that could change under a dict key
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f'UserProfile(firebase_uid={self.firebase_uid!r}, role={self.role!r})'
@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
@@ -6,7 +9,22 @@ from src.firebase_auth.core.logging import get_logger, setup_logging
 from src.firebase_auth.routes import create_auth_router
 from src.firebase_auth.services.auth_service import create_auth_service
 from src.firebase_auth.services.firebase_validator import create_firebase_validator
-from src.firebase_auth.services.user_context import create_simple_auth_service
+from src.firebase_auth.services.user_context import create_enriching_auth_service, create_simple_auth_service
+from src.firebase_auth.services.user_enrichment import UserEnrichmentService, create_user_enrichment_service
+from src.firebase_auth.services.user_store import create_mongo_user_store
+
+
+def create_enrichment_lifespan(user_enrichment: UserEnrichmentService):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        listener = asyncio.create_task(user_enrichment.run_invalidation_listener())
+        yield
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
+        await user_enrichment.aclose()
+        await user_enrichment.user_store.close()
+
+    return lifespan
 
 
 def create_app() -> FastAPI:
@@ -18,22 +36,42 @@ def create_app() -> FastAPI:
     logger.info(f'Environment: {settings.environment}')
     logger.info(f'Firebase Project: {settings.firebase_admin_project_id}')
 
+    # Create Firebase validator with simplified parameters (same as frontend)
+    firebase_validator = create_firebase_validator(
+        private_key=settings.firebase_admin_private_key,
+        client_email=settings.firebase_admin_client_email,
+        project_id=settings.firebase_admin_project_id,
+    )
+
+    lifespan = None
+    if settings.mongo_uri:
+        user_store = create_mongo_user_store(
+            settings.mongo_uri, settings.mongo_database, settings.mongo_users_collection, settings.mongo_timeout_ms
+        )
+        user_enrichment = create_user_enrichment_service(
+            user_store,
+            max_memory_mb=settings.user_profile_cache_max_memory_mb,
+            ttl_seconds=settings.user_profile_cache_ttl_seconds,
+            max_batch_size=settings.user_profile_batch_size,
+            failure_backoff_seconds=settings.user_profile_failure_backoff_seconds,
+        )
+        simple_auth_service = create_enriching_auth_service(user_enrichment, settings.user_profile_lookup_timeout_seconds)
+        lifespan = create_enrichment_lifespan(user_enrichment)
+        logger.info(
+            f'User profile enrichment enabled from collection: {settings.mongo_database}.{settings.mongo_users_collection}'
+        )
+    else:
+        simple_auth_service = create_simple_auth_service()
+
     app = FastAPI(
         title='PrimaLab Firebase Auth Service',
         description='Lightweight authentication proxy for Firebase token validation',
         version='0.1.0',
         docs_url='/docs' if settings.environment == 'development' else None,
         redoc_url=None,
+        lifespan=lifespan,
     )
 
-    # Create Firebase validator with simplified parameters (same as frontend)
-    firebase_validator = create_firebase_validator(
-        private_key=settings.firebase_admin_private_key,
-        client_email=settings.firebase_admin_client_email,
-        project_id=settings.firebase_admin_project_id,
-    )
-
-    simple_auth_service = create_simple_auth_service()
     auth_service = create_auth_service(firebase_validator, simple_auth_service)
 
     auth_router = create_auth_router(auth_service)
@@ -21,18 +21,18 @@ class AuthService:
         if not token:
             raise AuthError('Missing token')
 
-        firebase_data = await self.firebase_validator.validate_token(token)
+        identity = await self.firebase_validator.validate_token(token)
 
         auth_response = await self.simple_auth_service.create_auth_response(
-            firebase_uid=firebase_data['firebase_uid'],
-            email=firebase_data['email'],
-            name=firebase_data['name'],
-            role=firebase_data['role'],
-            permissions=firebase_data['permissions'],
-            first_name=firebase_data['first_name'],
-            last_name=firebase_data['last_name'],
-            picture=firebase_data.get('picture'),
-            email_verified=firebase_data['email_verified'],
+            firebase_uid=identity.firebase_uid,
+            email=identity.email,
+            name=identity.name,
+            role=identity.role,
+            permissions=list(identity.permissions),
+            first_name=identity.first_name,
+            last_name=identity.last_name,
+            picture=identity.picture,
+            email_verified=identity.email_verified,
         )
 
         self.logger.debug(f'Successfully validated token for user: {auth_response.user_email} with role: {auth_response.role}')
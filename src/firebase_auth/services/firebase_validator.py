@@ -1,9 +1,8 @@
-from typing import Any, Dict
-
 import firebase_admin
 from firebase_admin import auth as firebase_auth
 from firebase_admin import credentials
 
+from src.firebase_auth.core.identity import VerifiedIdentity
 from src.firebase_auth.core.logging import get_logger
 from src.firebase_auth.core.models import AuthError
 
@@ -42,8 +41,8 @@ class FirebaseTokenValidator:
             self.logger.error(f'Failed to initialize Firebase: {str(e)}')
             raise AuthError(f'Firebase initialization failed: {str(e)}', 500)
 
-    async def validate_token(self, token: str) -> Dict[str, Any]:
-        """Validate Firebase ID token and return user claims."""
+    async def validate_token(self, token: str) -> VerifiedIdentity:
+        """Validate Firebase ID token and return the verified identity."""
         try:
             # Verify the token
             decoded_token = firebase_auth.verify_id_token(token)
@@ -62,6 +61,8 @@ class FirebaseTokenValidator:
             # Extract role and permissions from custom claims
             role = decoded_token.get('role', 'USER')
             permissions = decoded_token.get('permissions', [])
+            if not isinstance(permissions, list):
+                raise AuthError('Invalid token: malformed permissions claim')
 
             # Extract name information
             first_name = decoded_token.get('firstName', '') or decoded_token.get('given_name', '')
@@ -78,17 +79,17 @@ class FirebaseTokenValidator:
 
             self.logger.debug(f'Successfully validated Firebase token for user: {email} with role: {role}')
 
-            return {
-                'firebase_uid': firebase_uid,
-                'email': email,
-                'name': name,
-                'first_name': first_name,
-                'last_name': last_name,
-                'role': role,
-                'permissions': permissions,
-                'picture': picture,
-                'email_verified': email_verified,
-            }
+            return VerifiedIdentity(
+                firebase_uid=firebase_uid,
+                email=email,
+                name=name,
+                first_name=first_name,
+                last_name=last_name,
+                role=role,
+                permissions=permissions,
+                picture=picture,
+                email_verified=email_verified,
+            )
 
         except firebase_admin.auth.InvalidIdTokenError:
             self.logger.warning('Invalid Firebase token provided')
@@ -0,0 +1,93 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Optional, Tuple, TypeVar
+
+from src.firebase_auth.core.logging import get_logger
+
+V = TypeVar('V')
+
+# Approximate bookkeeping cost of one entry: the (value, size, expires_at) tuple with its int and float,
+# plus the OrderedDict hash table slot, index and linked-list node
+ENTRY_OVERHEAD_BYTES = sys.getsizeof((None, 0, 0.0)) + sys.getsizeof(1 << 10) + sys.getsizeof(0.0) + 112
+BYTES_PER_MB = 1024 * 1024
+
+
+class MemoryBudgetCache(Generic[V]):
+    """LRU cache bounded by the approximate memory footprint of its entries rather than their count.
+
+    When ``ttl_seconds`` is set, entries older than the TTL are treated as misses and dropped on access.
+    """
+
+    def __init__(self, max_memory_bytes: int, ttl_seconds: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_memory_bytes = max_memory_bytes
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: OrderedDict[str, Tuple[V, int, float]] = OrderedDict()
+        self._memory_usage = 0
+        self.logger = get_logger('memory_budget_cache')
+
+    @property
+    def memory_usage(self) -> int:
+        return self._memory_usage
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry)
+
+    def get(self, key: str) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._is_expired(entry):
+            self.invalidate(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, value: V) -> bool:
+        size = self.entry_size(key, value)
+        self.invalidate(key)
+        if size > self.max_memory_bytes:
+            self.logger.warning(f'Cache entry of {size} bytes exceeds the {self.max_memory_bytes} byte budget')
+            return False
+
+        expires_at = self.clock() + self.ttl_seconds if self.ttl_seconds is not None else float('inf')
+        self._entries[key] = (value, size, expires_at)
+        self._memory_usage += size
+        self._evict()
+        return True
+
+    def invalidate(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._memory_usage -= entry[1]
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self._memory_usage = 0
+
+    @staticmethod
+    def entry_size(key: str, value: V) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value) + ENTRY_OVERHEAD_BYTES
+
+    def _is_expired(self, entry: Tuple[V, int, float]) -> bool:
+        return entry[2] <= self.clock()
+
+    def _evict(self):
+        evicted = 0
+        while self._memory_usage > self.max_memory_bytes:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._memory_usage -= size
+            evicted += 1
+        if evicted:
+            self.logger.debug(f'Evicted {evicted} cache entries, usage now {self._memory_usage} bytes')
+
+
+def create_memory_budget_cache(max_memory_mb: float, ttl_seconds: Optional[float] = None) -> MemoryBudgetCache:
+    return MemoryBudgetCache(int(max_memory_mb * BYTES_PER_MB), ttl_seconds)
@@ -1,7 +1,10 @@
+import asyncio
 from typing import List, Optional
 
+from src.firebase_auth.core.identity import UserProfile
 from src.firebase_auth.core.logging import get_logger
 from src.firebase_auth.core.models import AuthValidationResponse
+from src.firebase_auth.services.user_enrichment import UserEnrichmentService, UserStoreUnavailableError
 
 
 class SimpleAuthService:
@@ -35,5 +38,54 @@ class SimpleAuthService:
         )
 
 
+class EnrichingAuthService(SimpleAuthService):
+    """Overrides token claims with the cached user profile so role and permission changes apply before token refresh."""
+
+    def __init__(self, user_enrichment: UserEnrichmentService, lookup_timeout_seconds: float):
+        super().__init__()
+        self.user_enrichment = user_enrichment
+        self.lookup_timeout_seconds = lookup_timeout_seconds
+
+    async def create_auth_response(
+        self,
+        firebase_uid: str,
+        email: str,
+        name: str,
+        role: str,
+        permissions: List[str],
+        first_name: str,
+        last_name: str,
+        picture: Optional[str] = None,
+        email_verified: bool = False,
+    ) -> AuthValidationResponse:
+        try:
+            profile = await asyncio.wait_for(self.user_enrichment.get_profile(firebase_uid), self.lookup_timeout_seconds)
+        except UserStoreUnavailableError:
+            profile = UserProfile(firebase_uid)
+        except asyncio.TimeoutError:
+            # Timeouts repeat on every request until the store's own timeout starts the failure backoff
+            self.logger.debug(f'Falling back to token claims for user: {email}, profile lookup timed out')
+            profile = UserProfile(firebase_uid)
+        except Exception as e:
+            self.logger.warning(f'Falling back to token claims for user: {email}, profile lookup failed: {e!r}')
+            profile = UserProfile(firebase_uid)
+
+        return await super().create_auth_response(
+            firebase_uid=firebase_uid,
+            email=email,
+            name=profile.name if profile.name is not None else name,
+            role=profile.role if profile.role is not None else role,
+            permissions=list(profile.permissions) if profile.permissions is not None else permissions,
+            first_name=profile.first_name if profile.first_name is not None else first_name,
+            last_name=profile.last_name if profile.last_name is not None else last_name,
+            picture=profile.picture if profile.picture is not None else picture,
+            email_verified=email_verified,
+        )
+
+
 def create_simple_auth_service() -> SimpleAuthService:
     return SimpleAuthService()
+
+
+def create_enriching_auth_service(user_enrichment: UserEnrichmentService, lookup_timeout_seconds: float) -> EnrichingAuthService:
+    return EnrichingAuthService(user_enrichment, lookup_timeout_seconds)
@@ -0,0 +1,154 @@
+import asyncio
+from typing import Dict, Iterable, List, Set, Tuple
+
+from src.firebase_auth.core.identity import UserProfile
+from src.firebase_auth.core.logging import get_logger
+from src.firebase_auth.services.memory_budget_cache import MemoryBudgetCache, create_memory_budget_cache
+from src.firebase_auth.services.user_store import UserStore
+
+
+class UserStoreUnavailableError(Exception):
+    pass
+
+
+class UserEnrichmentService:
+    """Read-through cache of user profiles in front of a user store.
+
+    Concurrent misses for the same uid share one load, and misses raised in the same event loop tick
+    are coalesced into ``load_many`` batches of at most ``max_batch_size`` uids. After a failed load,
+    misses fail fast for ``failure_backoff_seconds`` instead of querying the store again.
+    """
+
+    def __init__(
+        self,
+        user_store: UserStore,
+        cache: MemoryBudgetCache[UserProfile],
+        max_batch_size: int,
+        retry_delay_seconds: float,
+        failure_backoff_seconds: float,
+    ):
+        self.user_store = user_store
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.retry_delay_seconds = retry_delay_seconds
+        self.failure_backoff_seconds = failure_backoff_seconds
+        self.logger = get_logger('user_enrichment_service')
+        self._backoff_until = float('-inf')
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get_profile(self, firebase_uid: str) -> UserProfile:
+        profile = self.cache.get(firebase_uid)
+        if profile is not None:
+            return profile
+        if self.cache.clock() < self._backoff_until:
+            raise UserStoreUnavailableError('User store failed recently, skipping profile lookup')
+        return await asyncio.shield(self._schedule_load(firebase_uid))
+
+    async def prefetch(self, firebase_uids: Iterable[str]):
+        if self.cache.clock() < self._backoff_until:
+            raise UserStoreUnavailableError('User store failed recently, skipping profile prefetch')
+        futures = [self._schedule_load(uid) for uid in set(firebase_uids) if self.cache.get(uid) is None]
+        self._flush()
+        await asyncio.gather(*(asyncio.shield(future) for future in futures))
+
+    def invalidate(self, firebase_uid: str):
+        self.cache.invalidate(firebase_uid)
+        self._inflight.pop(firebase_uid, None)
+
+    def invalidate_all(self):
+        self.cache.clear()
+        self._inflight.clear()
+
+    async def aclose(self):
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_invalidation_listener(self):
+        while True:
+            try:
+                async for firebase_uid in self.user_store.watch_changes():
+                    if firebase_uid is None:
+                        self.logger.info('User collection changed as a whole, clearing profile cache')
+                        self.invalidate_all()
+                        continue
+                    self.logger.debug(f'Invalidating cached profile for user: {firebase_uid}')
+                    self.invalidate(firebase_uid)
+                self.logger.warning('User change notifications unavailable, relying on profile cache TTL')
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f'User change stream failed, clearing profile cache: {str(e)}')
+                self.invalidate_all()
+                await asyncio.sleep(self.retry_delay_seconds)
+
+    def _schedule_load(self, firebase_uid: str) -> asyncio.Future:
+        future = self._inflight.get(firebase_uid)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[firebase_uid] = future
+        self._pending.append((firebase_uid, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.max_batch_size):
+            task = asyncio.create_task(self._load_batch(pending[start : start + self.max_batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            profiles = await self.user_store.load_many([uid for uid, _ in batch])
+        except Exception as e:
+            self.logger.error(f'Failed to load {len(batch)} user profiles: {str(e)}')
+            self._backoff_until = self.cache.clock() + self.failure_backoff_seconds
+            for uid, future in batch:
+                if self._inflight.get(uid) is future:
+                    del self._inflight[uid]
+                future.set_exception(e)
+                future.exception()  # Mark retrieved in case every waiter was cancelled
+            return
+        except BaseException:
+            for uid, future in batch:
+                if self._inflight.get(uid) is future:
+                    del self._inflight[uid]
+                future.cancel()
+            raise
+
+        for uid, future in batch:
+            profile = profiles.get(uid) or UserProfile(uid)
+            # An invalidation during the load drops the future, so the possibly stale result is not cached
+            if self._inflight.get(uid) is future:
+                del self._inflight[uid]
+                self.cache.put(uid, profile)
+            future.set_result(profile)
+
+
+def create_user_enrichment_service(
+    user_store: UserStore,
+    max_memory_mb: float,
+    ttl_seconds: float,
+    max_batch_size: int = 100,
+    retry_delay_seconds: float = 5.0,
+    failure_backoff_seconds: float = 5.0,
+) -> UserEnrichmentService:
+    return UserEnrichmentService(
+        user_store,
+        create_memory_budget_cache(max_memory_mb, ttl_seconds),
+        max_batch_size,
+        retry_delay_seconds,
+        failure_backoff_seconds,
+    )
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Protocol
+
+import pymongo
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import OperationFailure
+
+from src.firebase_auth.core.identity import UserProfile
+from src.firebase_auth.core.logging import get_logger
+
+CHANGE_STREAM_NOT_SUPPORTED = 40573
+COLLECTION_EVENTS = frozenset({'drop', 'rename', 'dropDatabase', 'invalidate'})
+
+
+class UserStore(Protocol):
+    async def load_many(self, firebase_uids: Iterable[str]) -> Dict[str, UserProfile]: ...
+
+    def watch_changes(self) -> AsyncIterator[Optional[str]]:
+        """Yield the uid of every changed user, or ``None`` when all users may have changed."""
+        ...
+
+    async def close(self): ...
+
+
+class InMemoryUserStore:
+    def __init__(self, profiles: Iterable[UserProfile] = ()):
+        self._profiles: Dict[str, UserProfile] = {profile.firebase_uid: profile for profile in profiles}
+        self._changes: asyncio.Queue[Optional[str]] = asyncio.Queue()
+
+    async def load_many(self, firebase_uids: Iterable[str]) -> Dict[str, UserProfile]:
+        return {uid: self._profiles[uid] for uid in firebase_uids if uid in self._profiles}
+
+    def upsert(self, profile: UserProfile):
+        self._profiles[profile.firebase_uid] = profile
+        self._changes.put_nowait(profile.firebase_uid)
+
+    def delete(self, firebase_uid: str):
+        self._profiles.pop(firebase_uid, None)
+        self._changes.put_nowait(firebase_uid)
+
+    def clear(self):
+        self._profiles.clear()
+        self._changes.put_nowait(None)
+
+    async def watch_changes(self) -> AsyncIterator[Optional[str]]:
+        while True:
+            yield await self._changes.get()
+
+    async def close(self):
+        pass
+
+
+class MongoUserStore:
+    """User store backed by a MongoDB collection whose documents are keyed by Firebase UID (``_id``)."""
+
+    PROJECTION = {'role': 1, 'permissions': 1, 'name': 1, 'firstName': 1, 'lastName': 1, 'picture': 1}
+    STRING_FIELDS = ('role', 'name', 'firstName', 'lastName', 'picture')
+
+    def __init__(self, collection: AsyncCollection, query_timeout_seconds: float):
+        self.collection = collection
+        self.query_timeout_seconds = query_timeout_seconds
+        self.logger = get_logger('mongo_user_store')
+
+    async def load_many(self, firebase_uids: Iterable[str]) -> Dict[str, UserProfile]:
+        with pymongo.timeout(self.query_timeout_seconds):
+            cursor = self.collection.find({'_id': {'$in': list(firebase_uids)}}, self.PROJECTION)
+            return {document['_id']: self._to_profile(document) async for document in cursor}
+
+    async def watch_changes(self) -> AsyncIterator[Optional[str]]:
+        try:
+            # An invalidate event closes the stream, so it is reopened until change streams turn out to be unsupported
+            while True:
+                async with await self.collection.watch() as stream:
+                    async for change in stream:
+                        document_key = change.get('documentKey')
+                        if document_key is not None:
+                            yield document_key['_id']
+                        elif change.get('operationType') in COLLECTION_EVENTS:
+                            yield None
+        except OperationFailure as e:
+            if e.code != CHANGE_STREAM_NOT_SUPPORTED:
+                raise
+            self.logger.warning('MongoDB change streams require a replica set, profile invalidation is disabled')
+
+    async def close(self):
+        await self.collection.database.client.close()
+
+    def _to_profile(self, document: Dict[str, Any]) -> UserProfile:
+        if not self._is_valid(document):
+            self.logger.warning(f'Ignoring malformed user document: {document["_id"]}')
+            return UserProfile(document['_id'])
+
+        return UserProfile(
+            firebase_uid=document['_id'],
+            role=document.get('role'),
+            permissions=document.get('permissions'),
+            name=document.get('name'),
+            first_name=document.get('firstName'),
+            last_name=document.get('lastName'),
+            picture=document.get('picture'),
+        )
+
+    @classmethod
+    def _is_valid(cls, document: Dict[str, Any]) -> bool:
+        if not isinstance(document['_id'], str):
+            return False
+        if any(document.get(field) is not None and not isinstance(document[field], str) for field in cls.STRING_FIELDS):
+            return False
+        permissions = document.get('permissions')
+        if permissions is None:
+            return True
+        return isinstance(permissions, (list, tuple)) and all(isinstance(permission, str) for permission in permissions)
+
+
+def create_in_memory_user_store(profiles: Iterable[UserProfile] = ()) -> InMemoryUserStore:
+    return InMemoryUserStore(profiles)
+
+
+def create_mongo_user_store(mongo_uri: str, database: str, collection: str, timeout_ms: int) -> MongoUserStore:
+    client = AsyncMongoClient(mongo_uri, serverSelectionTimeoutMS=timeout_ms, connectTimeoutMS=timeout_ms)
+    return MongoUserStore(client[database][collection], query_timeout_seconds=timeout_ms / 1000)
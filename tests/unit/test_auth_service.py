@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, Mock
 import pytest
 import pytest_asyncio
 
+from src.firebase_auth.core.identity import VerifiedIdentity
 from src.firebase_auth.core.models import AuthError, AuthValidationResponse
 from src.firebase_auth.services.auth_service import AuthService
 from src.firebase_auth.services.firebase_validator import FirebaseTokenValidator
@@ -18,17 +19,17 @@ class TestAuthService:
 
     @pytest.mark.asyncio
     async def test_validate_and_enrich_success(self):
-        firebase_data = {
-            'firebase_uid': 'test-uid',
-            'email': 'test@example.com',
-            'name': 'Test User',
-            'first_name': 'Test',
-            'last_name': 'User',
-            'role': 'ADMIN',
-            'permissions': ['READ_USER', 'CREATE_USER'],
-            'picture': 'https://example.com/photo.jpg',
-            'email_verified': True,
-        }
+        identity = VerifiedIdentity(
+            firebase_uid='test-uid',
+            email='test@example.com',
+            name='Test User',
+            first_name='Test',
+            last_name='User',
+            role='ADMIN',
+            permissions=['READ_USER', 'CREATE_USER'],
+            picture='https://example.com/photo.jpg',
+            email_verified=True,
+        )
         auth_response = AuthValidationResponse(
             user_email='test@example.com',
             user_name='Test User',
@@ -41,7 +42,7 @@ class TestAuthService:
             email_verified=True,
         )
 
-        self.mock_firebase_validator.validate_token = AsyncMock(return_value=firebase_data)
+        self.mock_firebase_validator.validate_token = AsyncMock(return_value=identity)
         self.mock_simple_auth_service.create_auth_response = AsyncMock(return_value=auth_response)
 
         result = await self.auth_service.validate_and_enrich('Bearer test-token')
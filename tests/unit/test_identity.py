@@ -0,0 +1,79 @@
+import sys
+
+import pytest
+
+from src.firebase_auth.core import identity
+from src.firebase_auth.core.identity import MAX_INTERNED_PERMISSION_SETS, UserProfile, VerifiedIdentity, intern_permissions
+
+
+def make_identity(index: int, role: str = 'USER', permissions=('READ_PATIENT', 'CREATE_PATIENT')) -> VerifiedIdentity:
+    return VerifiedIdentity(
+        firebase_uid=f'uid-{index}',
+        email=f'user{index}@example.com',
+        name=f'User {index}',
+        first_name='User',
+        last_name=f'{index}',
+        role=role,
+        permissions=list(permissions),
+        email_verified=True,
+    )
+
+
+@pytest.fixture
+def permission_pool():
+    saved = identity._permission_pool.copy()
+    yield identity._permission_pool
+    identity._permission_pool.clear()
+    identity._permission_pool.update(saved)
+
+
+class TestVerifiedIdentity:
+    def test_role_and_permissions_are_shared_across_users(self):
+        first = make_identity(1, role=''.join(['AD', 'MIN']))
+        second = make_identity(2, role=''.join(['ADM', 'IN']))
+
+        assert first.role is second.role
+        assert first.permissions is second.permissions
+        assert first.permissions is intern_permissions(['READ_PATIENT', 'CREATE_PATIENT'])
+
+    def test_permission_pool_evicts_least_recently_used_sets(self, permission_pool):
+        evicted = intern_permissions(['EVICTED_PERMISSION'])
+        retained = intern_permissions(['RETAINED_PERMISSION'])
+
+        for index in range(MAX_INTERNED_PERMISSION_SETS - 1):
+            intern_permissions(['RETAINED_PERMISSION'])
+            intern_permissions([f'PERMISSION_{index}'])
+
+        assert intern_permissions(['RETAINED_PERMISSION']) is retained
+        assert intern_permissions(['EVICTED_PERMISSION']) is not evicted
+        assert len(permission_pool) == MAX_INTERNED_PERMISSION_SETS
+
+    def test_permissions_are_stored_as_tuple(self):
+        identity = make_identity(1, permissions=['READ_USER', 'CREATE_USER'])
+
+        assert identity.permissions == ('READ_USER', 'CREATE_USER')
+
+    def test_has_no_instance_dict(self):
+        assert not hasattr(make_identity(1), '__dict__')
+
+    def test_is_smaller_than_claims_dict(self):
+        identity = make_identity(1)
+        claims = {field: getattr(identity, field) for field in VerifiedIdentity.__slots__}
+        claims['permissions'] = list(identity.permissions)
+        claims_size = sys.getsizeof(claims) + sum(sys.getsizeof(value) for value in claims.values())
+
+        assert sys.getsizeof(identity) < claims_size
+
+    def test_is_compared_by_value_and_unhashable(self):
+        assert make_identity(1) == make_identity(1)
+        with pytest.raises(TypeError):
+            hash(make_identity(1))
+
+
+class TestUserProfile:
+    def test_is_compared_by_value_and_unhashable(self):
+        assert UserProfile('uid-1', role='ADMIN', permissions=['READ_USER']) == UserProfile(
+            'uid-1', role='ADMIN', permissions=['READ_USER']
+        )
+        with pytest.raises(TypeError):
+            hash(UserProfile('uid-1'))
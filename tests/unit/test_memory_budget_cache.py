@@ -0,0 +1,87 @@
+import gc
+import tracemalloc
+
+from src.firebase_auth.core.identity import VerifiedIdentity
+from src.firebase_auth.services.memory_budget_cache import BYTES_PER_MB, MemoryBudgetCache, create_memory_budget_cache
+
+
+def make_identity(index: int, role: str = 'USER', permissions=('READ_PATIENT', 'CREATE_PATIENT')) -> VerifiedIdentity:
+    return VerifiedIdentity(
+        firebase_uid=f'uid-{index:028d}',
+        email=f'user{index}@example.com',
+        name=f'User {index}',
+        first_name=f'First{index}',
+        last_name=f'{index}',
+        role=role,
+        permissions=list(permissions),
+        email_verified=True,
+    )
+
+
+class TestMemoryBudgetCache:
+    def test_get_returns_stored_identity(self):
+        cache = MemoryBudgetCache(max_memory_bytes=BYTES_PER_MB)
+        identity = make_identity(1)
+
+        assert cache.put('uid-1', identity)
+
+        assert cache.get('uid-1') is identity
+        assert cache.get('uid-2') is None
+
+    def test_tracks_memory_usage(self):
+        cache = MemoryBudgetCache(max_memory_bytes=BYTES_PER_MB)
+        identity = make_identity(1)
+
+        cache.put('uid-1', identity)
+        assert cache.memory_usage == MemoryBudgetCache.entry_size('uid-1', identity)
+
+        cache.put('uid-1', make_identity(1))
+        assert len(cache) == 1
+        assert cache.memory_usage == MemoryBudgetCache.entry_size('uid-1', identity)
+
+        cache.invalidate('uid-1')
+        assert cache.memory_usage == 0
+
+    def test_evicts_least_recently_used_when_over_budget(self):
+        entry_size = MemoryBudgetCache.entry_size('key-0', make_identity(0))
+        cache = MemoryBudgetCache(max_memory_bytes=entry_size * 3)
+
+        for index in range(3):
+            cache.put(f'key-{index}', make_identity(index))
+        cache.get('key-0')
+        cache.put('key-3', make_identity(3))
+
+        assert len(cache) == 3
+        assert 'key-1' not in cache
+        assert 'key-0' in cache
+        assert cache.memory_usage <= cache.max_memory_bytes
+
+    def test_rejects_entry_larger_than_budget(self):
+        cache = MemoryBudgetCache(max_memory_bytes=64)
+
+        assert not cache.put('uid-1', make_identity(1))
+        assert len(cache) == 0
+        assert cache.memory_usage == 0
+
+    def test_create_memory_budget_cache_uses_megabytes(self):
+        cache = create_memory_budget_cache(max_memory_mb=0.5)
+
+        assert cache.max_memory_bytes == BYTES_PER_MB // 2
+
+    def test_bytes_per_entry(self):
+        entries = 5000
+        cache = MemoryBudgetCache(max_memory_bytes=64 * BYTES_PER_MB)
+        make_identity(0)
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for index in range(entries):
+            cache.put(f'key-{index:028d}', make_identity(index))
+        measured_per_entry = (tracemalloc.get_traced_memory()[0] - before) / entries
+        tracemalloc.stop()
+
+        estimated_per_entry = cache.memory_usage / entries
+
+        assert estimated_per_entry < 768
+        assert 0.9 < estimated_per_entry / measured_per_entry < 1.1
@@ -0,0 +1,236 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+
+from src.firebase_auth.core.identity import UserProfile
+from src.firebase_auth.services.memory_budget_cache import BYTES_PER_MB, MemoryBudgetCache
+from src.firebase_auth.services.user_context import EnrichingAuthService
+from src.firebase_auth.services.user_enrichment import UserEnrichmentService, UserStoreUnavailableError
+from src.firebase_auth.services.user_store import InMemoryUserStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestUserEnrichmentService:
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self):
+        self.store = InMemoryUserStore(
+            [
+                UserProfile('uid-1', role='ADMIN', permissions=['READ_USER', 'CREATE_USER']),
+                UserProfile('uid-2', role='USER', permissions=['READ_USER']),
+            ]
+        )
+        self.store.load_many = AsyncMock(side_effect=self.store.load_many)
+        self.clock = FakeClock()
+        self.cache = MemoryBudgetCache(BYTES_PER_MB, ttl_seconds=60, clock=self.clock)
+        self.service = UserEnrichmentService(
+            self.store, self.cache, max_batch_size=2, retry_delay_seconds=0, failure_backoff_seconds=5
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_profile_reads_through_cache(self):
+        first = await self.service.get_profile('uid-1')
+        second = await self.service.get_profile('uid-1')
+
+        assert first.role == 'ADMIN'
+        assert first.permissions == ('READ_USER', 'CREATE_USER')
+        assert second is first
+        self.store.load_many.assert_called_once_with(['uid-1'])
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_cached_as_empty_profile(self):
+        profile = await self.service.get_profile('uid-unknown')
+        await self.service.get_profile('uid-unknown')
+
+        assert profile == UserProfile('uid-unknown')
+        assert self.store.load_many.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_are_single_flight(self):
+        profiles = await asyncio.gather(*(self.service.get_profile('uid-1') for _ in range(10)))
+
+        assert all(profile is profiles[0] for profile in profiles)
+        self.store.load_many.assert_called_once_with(['uid-1'])
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_batched(self):
+        profiles = await asyncio.gather(self.service.get_profile('uid-1'), self.service.get_profile('uid-2'))
+
+        assert [profile.role for profile in profiles] == ['ADMIN', 'USER']
+        self.store.load_many.assert_called_once_with(['uid-1', 'uid-2'])
+
+    @pytest.mark.asyncio
+    async def test_prefetch_loads_in_batches_of_max_size(self):
+        await self.service.get_profile('uid-1')
+
+        await self.service.prefetch(['uid-1', 'uid-2', 'uid-3', 'uid-4'])
+
+        batches = [sorted(call.args[0]) for call in self.store.load_many.call_args_list[1:]]
+        assert sorted(uid for batch in batches for uid in batch) == ['uid-2', 'uid-3', 'uid-4']
+        assert all(len(batch) <= 2 for batch in batches)
+        assert 'uid-4' in self.cache
+
+    @pytest.mark.asyncio
+    async def test_expired_profile_is_reloaded(self):
+        await self.service.get_profile('uid-1')
+        self.clock.now = 61
+
+        await self.service.get_profile('uid-1')
+
+        assert self.store.load_many.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_change_notification_invalidates_profile(self):
+        await self.service.get_profile('uid-1')
+        listener = asyncio.create_task(self.service.run_invalidation_listener())
+        await asyncio.sleep(0)
+        assert 'uid-1' in self.cache
+
+        self.store.upsert(UserProfile('uid-1', role='USER', permissions=[]))
+        await asyncio.sleep(0)
+        assert 'uid-1' not in self.cache
+        profile = await self.service.get_profile('uid-1')
+
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+        assert profile.role == 'USER'
+        assert profile.permissions == ()
+
+    @pytest.mark.asyncio
+    async def test_collection_change_clears_all_profiles(self):
+        await self.service.prefetch(['uid-1', 'uid-2'])
+        listener = asyncio.create_task(self.service.run_invalidation_listener())
+        await asyncio.sleep(0)
+
+        self.store.clear()
+        await asyncio.sleep(0)
+
+        listener.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await listener
+        assert len(self.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_loads_and_releases_inflight_uids(self):
+        loading = asyncio.Event()
+
+        async def hanging_load_many(firebase_uids):
+            loading.set()
+            await asyncio.Event().wait()
+
+        self.store.load_many.side_effect = hanging_load_many
+        pending = asyncio.create_task(self.service.get_profile('uid-1'))
+        await loading.wait()
+
+        await self.service.aclose()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(pending, timeout=1)
+        self.store.load_many.side_effect = None
+        self.store.load_many.return_value = {}
+        assert await asyncio.wait_for(self.service.get_profile('uid-1'), timeout=1) == UserProfile('uid-1')
+        assert self.store.load_many.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_load_does_not_cache_stale_profile(self):
+        pending = asyncio.create_task(self.service.get_profile('uid-1'))
+        await asyncio.sleep(0)
+
+        self.service.invalidate('uid-1')
+        await pending
+
+        assert 'uid-1' not in self.cache
+
+    @pytest.mark.asyncio
+    async def test_store_failure_is_not_cached(self):
+        self.store.load_many.side_effect = RuntimeError('connection refused')
+
+        with pytest.raises(RuntimeError):
+            await self.service.get_profile('uid-1')
+
+        assert 'uid-1' not in self.cache
+
+    @pytest.mark.asyncio
+    async def test_store_failure_backs_off_before_retrying(self):
+        self.store.load_many.side_effect = RuntimeError('connection refused')
+        with pytest.raises(RuntimeError):
+            await self.service.get_profile('uid-1')
+
+        with pytest.raises(UserStoreUnavailableError):
+            await self.service.get_profile('uid-2')
+        assert self.store.load_many.call_count == 1
+
+        self.store.load_many.side_effect = None
+        self.store.load_many.return_value = {}
+        self.clock.now = 6
+        await self.service.get_profile('uid-2')
+        assert self.store.load_many.call_count == 2
+
+
+class TestEnrichingAuthService:
+    @pytest_asyncio.fixture(autouse=True)
+    async def setup(self):
+        self.user_enrichment = AsyncMock(spec=UserEnrichmentService)
+        self.auth_service = EnrichingAuthService(self.user_enrichment, lookup_timeout_seconds=0.05)
+        self.claims = {
+            'firebase_uid': 'uid-1',
+            'email': 'test@example.com',
+            'name': 'Test User',
+            'role': 'USER',
+            'permissions': ['READ_USER'],
+            'first_name': 'Test',
+            'last_name': 'User',
+            'picture': 'https://example.com/photo.jpg',
+            'email_verified': True,
+        }
+
+    @pytest.mark.asyncio
+    async def test_profile_overrides_token_claims(self):
+        self.user_enrichment.get_profile.return_value = UserProfile(
+            'uid-1', role='ADMIN', permissions=['READ_USER', 'CREATE_USER'], last_name='Doe'
+        )
+
+        response = await self.auth_service.create_auth_response(**self.claims)
+
+        assert response.role == 'ADMIN'
+        assert response.permissions == ['READ_USER', 'CREATE_USER']
+        assert response.last_name == 'Doe'
+        assert response.first_name == 'Test'
+        assert response.picture == 'https://example.com/photo.jpg'
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_token_claims_when_store_fails(self):
+        self.user_enrichment.get_profile.side_effect = RuntimeError('connection refused')
+
+        response = await self.auth_service.create_auth_response(**self.claims)
+
+        assert response.role == 'USER'
+        assert response.permissions == ['READ_USER']
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_token_claims_when_store_is_slow(self):
+        async def slow_load_many(firebase_uids):
+            await asyncio.sleep(10)
+            return {}
+
+        store = InMemoryUserStore()
+        store.load_many = slow_load_many
+        user_enrichment = UserEnrichmentService(
+            store, MemoryBudgetCache(BYTES_PER_MB), max_batch_size=10, retry_delay_seconds=0, failure_backoff_seconds=5
+        )
+        auth_service = EnrichingAuthService(user_enrichment, lookup_timeout_seconds=0.05)
+
+        response = await asyncio.wait_for(auth_service.create_auth_response(**self.claims), timeout=1)
+
+        assert response.role == 'USER'
+        assert response.permissions == ['READ_USER']
+        await user_enrichment.aclose()
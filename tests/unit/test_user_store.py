@@ -0,0 +1,91 @@
+import pytest
+from pymongo.errors import OperationFailure
+
+from src.firebase_auth.core.identity import UserProfile
+from src.firebase_auth.services.user_store import CHANGE_STREAM_NOT_SUPPORTED, MongoUserStore
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class FakeChangeStream(FakeCursor):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+class FakeCollection:
+    def __init__(self, documents, change_streams=()):
+        self.documents = documents
+        self.change_streams = list(change_streams)
+
+    def find(self, query, projection):
+        return FakeCursor([document for document in self.documents if document['_id'] in query['_id']['$in']])
+
+    async def watch(self):
+        if not self.change_streams:
+            raise OperationFailure('The $changeStream stage is only supported on replica sets', CHANGE_STREAM_NOT_SUPPORTED)
+        return FakeChangeStream(self.change_streams.pop(0))
+
+
+class TestMongoUserStore:
+    @pytest.mark.asyncio
+    async def test_load_many_maps_documents_to_profiles(self):
+        store = MongoUserStore(
+            FakeCollection([{'_id': 'uid-1', 'role': 'ADMIN', 'permissions': ['READ_USER'], 'firstName': 'Jane'}]),
+            query_timeout_seconds=1,
+        )
+
+        profiles = await store.load_many(['uid-1', 'uid-2'])
+
+        assert profiles == {'uid-1': UserProfile('uid-1', role='ADMIN', permissions=['READ_USER'], first_name='Jane')}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        'document',
+        [
+            {'_id': 'bad', 'role': 5},
+            {'_id': 'bad', 'permissions': 'ADMIN'},
+            {'_id': 'bad', 'permissions': ['READ_USER', 7]},
+            {'_id': 'bad', 'lastName': ['Doe']},
+        ],
+    )
+    async def test_malformed_document_does_not_fail_batch(self, document):
+        store = MongoUserStore(FakeCollection([document, {'_id': 'good', 'role': 'USER'}]), query_timeout_seconds=1)
+
+        profiles = await store.load_many(['bad', 'good'])
+
+        assert profiles['bad'] == UserProfile('bad')
+        assert profiles['good'].role == 'USER'
+
+    @pytest.mark.asyncio
+    async def test_watch_changes_signals_collection_events_and_reopens_stream(self):
+        store = MongoUserStore(
+            FakeCollection(
+                [],
+                change_streams=[
+                    [
+                        {'operationType': 'update', 'documentKey': {'_id': 'uid-1'}},
+                        {'operationType': 'drop'},
+                        {'operationType': 'invalidate'},
+                    ],
+                    [{'operationType': 'delete', 'documentKey': {'_id': 'uid-2'}}],
+                ],
+            ),
+            query_timeout_seconds=1,
+        )
+
+        changes = [firebase_uid async for firebase_uid in store.watch_changes()]
+
+        assert changes == ['uid-1', None, None, 'uid-2']